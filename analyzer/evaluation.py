@@ -0,0 +1,230 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .sections import parse_response
+from .stats import percentile
+from .views import build_messages, request_analysis
+
+CORPUS_DIR = Path(__file__).resolve().parent / "eval_corpus"
+
+# A backend takes (log_text, model, max_tokens) and returns the chat completion
+# response plus, for a replayed recording, the latency measured when it was
+# recorded (None when the response was produced by this call).
+Backend = Callable[[str, str, int], Tuple[Dict[str, Any], Optional[float]]]
+
+
+def load_corpus(directory: Path = CORPUS_DIR) -> List[Tuple[str, str]]:
+    """
+    Load the sample logs used for evaluation.
+
+    Args:
+        directory: Folder containing one *.log file per sample
+
+    Returns:
+        A list of (file name, log text) pairs sorted by name
+    """
+    return [(path.name, path.read_text(encoding="utf-8")) for path in sorted(directory.glob("*.log"))]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for backends without usage data."""
+    return max(1, len(text) // 4)
+
+
+def estimate_prompt_tokens(log_text: str) -> int:
+    """Estimated prompt tokens for the messages built from a log."""
+    return sum(estimate_tokens(message["content"]) for message in build_messages(log_text))
+
+
+def recording_key(log_text: str, model: str, max_tokens: int) -> str:
+    """Key identifying a request in a recordings file; changes whenever the prompt does."""
+    payload = json.dumps([model, max_tokens, build_messages(log_text)], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FakeBackend:
+    """
+    Deterministic stand-in for the chat API.
+
+    Returns a response in the four-section format requested by build_prompt,
+    truncated to max_tokens, and sleeps to simulate network and generation time.
+    """
+
+    def __init__(self, latency_ms: float = 20.0, ms_per_token: float = 0.5) -> None:
+        self.latency_ms = latency_ms
+        self.ms_per_token = ms_per_token
+
+    def __call__(self, log_text: str, model: str, max_tokens: int) -> Tuple[Dict[str, Any], Optional[float]]:
+        log_lines = [line.strip() for line in log_text.splitlines() if line.strip()]
+        error_line = log_lines[-1] if log_lines else "Erro desconhecido"
+
+        content = (
+            f"1. ERRO IDENTIFICADO: {error_line}\n\n"
+            "2. EXPLICAÇÃO:\n"
+            "O erro indica que o código encontrou uma condição inesperada durante a execução.\n\n"
+            "3. POSSÍVEIS CAUSAS:\n"
+            "- Configuração ausente ou incorreta\n"
+            "- Dados em formato inesperado\n\n"
+            "4. SUGESTÕES:\n"
+            "Revise o stacktrace a partir da última linha do seu código e valide os dados de entrada."
+        )
+        content = content[:max_tokens * 4]
+        completion_tokens = estimate_tokens(content)
+        time.sleep((self.latency_ms + completion_tokens * self.ms_per_token) / 1000)
+
+        response = {
+            "model": model,
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {
+                "prompt_tokens": estimate_prompt_tokens(log_text),
+                "completion_tokens": completion_tokens,
+            },
+        }
+        return response, None
+
+
+class RecordingMissingError(LookupError):
+    """Raised when a recorded-only run finds a request with no saved response."""
+
+
+class RecordedBackend:
+    """
+    Replays responses saved in a JSON recordings file.
+
+    Each recording stores the response together with the latency measured
+    when it was recorded, and a replay returns that latency. Requests without a
+    recording raise RecordingMissingError, unless a `fallback` backend is
+    given; fallback responses are counted as misses. When `record` is true,
+    fallback responses and their latencies are added to the recordings and
+    written back by save().
+    """
+
+    def __init__(self, path: Path, fallback: Optional[Backend] = None, record: bool = False) -> None:
+        self.path = path
+        self.fallback = fallback
+        self.record = record
+        self.recordings: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            # Entries without a measured latency cannot be replayed faithfully; treat them as missing
+            self.recordings = {
+                key: entry for key, entry in json.loads(path.read_text(encoding="utf-8")).items()
+                if isinstance(entry, dict) and "response" in entry and entry.get("latency_ms") is not None
+            }
+        self._lock = threading.Lock()
+
+    def __call__(self, log_text: str, model: str, max_tokens: int) -> Tuple[Dict[str, Any], Optional[float]]:
+        key = recording_key(log_text, model, max_tokens)
+        recorded = self.recordings.get(key)
+        if recorded is not None:
+            return recorded["response"], recorded["latency_ms"]
+        if self.fallback is None:
+            raise RecordingMissingError(f"No recording for model={model} max_tokens={max_tokens}")
+
+        started = time.perf_counter()
+        response, _ = self.fallback(log_text, model, max_tokens)
+        latency_ms = (time.perf_counter() - started) * 1000
+        if self.record:
+            with self._lock:
+                self.recordings[key] = {"response": response, "latency_ms": latency_ms}
+        return response, None
+
+    def save(self) -> None:
+        self.path.write_text(json.dumps(self.recordings, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def live_backend(log_text: str, model: str, max_tokens: int) -> Tuple[Dict[str, Any], Optional[float]]:
+    """Call the OpenAI chat API through the same request_analysis used by the analyze_log view."""
+    response = request_analysis(log_text, model=model, max_tokens=max_tokens)
+    # Convert the OpenAIObject to plain dicts so it can be recorded as JSON
+    return json.loads(json.dumps(response)), None
+
+
+def run_case(backend: Backend, model: str, max_tokens: int, log_text: str) -> Dict[str, Any]:
+    """
+    Push one log through the analysis pipeline: prompt, completion and section parsing.
+
+    Args:
+        backend: The completion backend
+        model: Model name passed to the backend
+        max_tokens: Completion token limit passed to the backend
+        log_text: The log to analyze
+
+    Returns:
+        A dict with latency_ms, prompt_tokens, completion_tokens, cache_hit,
+        compliant and error for this case. For replayed recordings, latency_ms
+        is the latency measured when the response was recorded.
+    """
+    started = time.perf_counter()
+    try:
+        response, recorded_latency_ms = backend(log_text, model, max_tokens)
+        content = response["choices"][0]["message"]["content"]
+    except RecordingMissingError:
+        raise
+    except Exception as e:
+        return {"latency_ms": (time.perf_counter() - started) * 1000, "error": str(e)}
+    cache_hit = recorded_latency_ms is not None
+    latency_ms = recorded_latency_ms if cache_hit else (time.perf_counter() - started) * 1000
+
+    usage = response.get("usage") or {}
+    sections = parse_response(content)
+    return {
+        "latency_ms": latency_ms,
+        "prompt_tokens": usage.get("prompt_tokens") or estimate_prompt_tokens(log_text),
+        "completion_tokens": usage.get("completion_tokens") or estimate_tokens(content),
+        "cache_hit": cache_hit,
+        "compliant": all(sections.values()),
+        "error": None,
+    }
+
+
+def evaluate(backend: Backend, corpus: List[Tuple[str, str]], model: str, max_tokens: int,
+             concurrency: int = 4, repeat: int = 1) -> Dict[str, Any]:
+    """
+    Run the corpus through the pipeline concurrently for one configuration.
+
+    Args:
+        backend: The completion backend
+        corpus: (name, log text) pairs from load_corpus
+        model: Model name for this configuration
+        max_tokens: Completion token limit for this configuration
+        concurrency: Number of worker threads
+        repeat: How many times each log is sent
+
+    Returns:
+        Aggregated metrics for the configuration. latency_* covers calls made
+        during this run; replay_latency_* covers replayed recordings, using
+        their recorded latencies. Either is None when it has no samples.
+    """
+    logs = [log_text for _, log_text in corpus] * repeat
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda log_text: run_case(backend, model, max_tokens, log_text), logs))
+    wall_seconds = time.perf_counter() - started
+
+    succeeded = [result for result in results if not result["error"]]
+    total = len(succeeded) or 1
+    live = [result["latency_ms"] for result in succeeded if not result["cache_hit"]]
+    replayed = [result["latency_ms"] for result in succeeded if result["cache_hit"]]
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "runs": len(results),
+        "errors": len(results) - len(succeeded),
+        "prompt_tokens": sum(result["prompt_tokens"] for result in succeeded),
+        "completion_tokens": sum(result["completion_tokens"] for result in succeeded),
+        "latency_p50_ms": percentile(live, 50) if live else None,
+        "latency_p90_ms": percentile(live, 90) if live else None,
+        "latency_p99_ms": percentile(live, 99) if live else None,
+        "replay_latency_p50_ms": percentile(replayed, 50) if replayed else None,
+        "replay_latency_p90_ms": percentile(replayed, 90) if replayed else None,
+        "replay_latency_p99_ms": percentile(replayed, 99) if replayed else None,
+        "cache_hit_rate": sum(result["cache_hit"] for result in succeeded) / total,
+        "cache_misses": sum(not result["cache_hit"] for result in succeeded),
+        "compliance_rate": sum(result["compliant"] for result in succeeded) / total,
+        "wall_seconds": wall_seconds,
+    }
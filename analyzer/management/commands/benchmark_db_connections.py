@@ -0,0 +1,95 @@
+import statistics
+import time
+from typing import Any, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from analyzer.models import LogAnalysis
+from analyzer.stats import percentile
+from analyzer.views import HISTORY_FIELDS
+
+# CONN_MAX_AGE used for the persistent run when the configured value is 0
+DEFAULT_PERSISTENT_MAX_AGE = 600
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request database overhead with a fresh connection per request "
+        "(CONN_MAX_AGE=0) versus a reused persistent connection."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--requests", type=int, default=50,
+            help="Simulated requests per mode (default: 50).",
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS,
+            help="Database alias to benchmark (default: default).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        requests: int = options["requests"]
+        alias: str = options["database"]
+        if requests < 1:
+            raise CommandError("--requests must be a positive integer.")
+        if alias not in connections.settings:
+            raise CommandError(f"Unknown database alias: {alias}")
+
+        settings_dict = connections[alias].settings_dict
+        if settings_dict.get("OPTIONS", {}).get("pool"):
+            raise CommandError(
+                "Connection pooling is enabled for this alias: closing a connection only returns it "
+                "to the pool, so the fresh-connection run would not open new connections. "
+                "Run the benchmark with DB_POOL=false."
+            )
+
+        configured_max_age = settings_dict.get("CONN_MAX_AGE", 0)
+        persistent_max_age = configured_max_age or DEFAULT_PERSISTENT_MAX_AGE
+        self.stdout.write(
+            f"Database '{alias}': CONN_MAX_AGE={configured_max_age}, "
+            f"CONN_HEALTH_CHECKS={settings_dict.get('CONN_HEALTH_CHECKS', False)}, pool=off"
+        )
+        self.stdout.write(f"Persistent run uses CONN_MAX_AGE={persistent_max_age}")
+
+        fresh = self._run(alias, requests, max_age=0)
+        persistent = self._run(alias, requests, max_age=persistent_max_age)
+
+        self.stdout.write(f"{'mode':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for label, timings in (("fresh", fresh), ("persistent", persistent)):
+            self.stdout.write(
+                f"{label:<12}{statistics.mean(timings):>10.2f}"
+                f"{percentile(timings, 50):>10.2f}{percentile(timings, 95):>10.2f}"
+            )
+        saved = statistics.mean(fresh) - statistics.mean(persistent)
+        self.stdout.write(self.style.SUCCESS(f"Persistent connections save {saved:.2f} ms per request on average"))
+
+    def _run(self, alias: str, requests: int, max_age: int) -> List[float]:
+        """
+        Time simulated requests that each run one history-style query, in milliseconds.
+
+        Each request sends request_started and request_finished, so Django's
+        close_old_connections and the CONN_HEALTH_CHECKS ping run exactly as
+        they do for a real request.
+        """
+        connection = connections[alias]
+        queryset = LogAnalysis.objects.using(alias).only(*HISTORY_FIELDS).order_by("-created_at")
+        original_max_age = connection.settings_dict.get("CONN_MAX_AGE", 0)
+        connection.close()
+        connection.settings_dict["CONN_MAX_AGE"] = max_age
+        try:
+            timings: List[float] = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                request_started.send(sender=self.__class__)
+                try:
+                    list(queryset[:20])
+                finally:
+                    request_finished.send(sender=self.__class__)
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = original_max_age
+        return timings
@@ -0,0 +1,119 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from analyzer.evaluation import (
+    CORPUS_DIR, FakeBackend, RecordedBackend, RecordingMissingError, evaluate, live_backend, load_corpus,
+)
+from analyzer.views import DEFAULT_MAX_TOKENS, DEFAULT_MODEL
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a corpus of sample logs through the analysis pipeline and report tokens, "
+        "latency percentiles, cache hit rate and section-format compliance per configuration."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--model", nargs="+", default=[DEFAULT_MODEL],
+            help=f"Models to compare (default: {DEFAULT_MODEL}).",
+        )
+        parser.add_argument(
+            "--max-tokens", nargs="+", type=int, default=[DEFAULT_MAX_TOKENS],
+            help=f"max_tokens values to compare (default: {DEFAULT_MAX_TOKENS}).",
+        )
+        parser.add_argument(
+            "--backend", choices=["fake", "recorded", "live"], default="fake",
+            help="fake: deterministic offline responses; recorded: replay --recordings; "
+                 "live: call the OpenAI API (default: fake).",
+        )
+        parser.add_argument(
+            "--allow-fake-fallback", action="store_true",
+            help="With --backend recorded, answer missing recordings with the fake backend "
+                 "instead of failing. Those runs are counted as cache misses.",
+        )
+        parser.add_argument(
+            "--recordings", type=Path,
+            help="JSON recordings file. Required for --backend recorded; with --backend live, "
+                 "responses are saved to it.",
+        )
+        parser.add_argument("--corpus", type=Path, default=CORPUS_DIR, help="Folder of *.log samples.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Worker threads (default: 4).")
+        parser.add_argument("--repeat", type=int, default=1, help="Times each log is sent (default: 1).")
+        parser.add_argument(
+            "--fake-latency-ms", type=float, default=20.0,
+            help="Base latency simulated by the fake backend (default: 20).",
+        )
+        parser.add_argument("--json", type=Path, help="Also write the report to this JSON file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["concurrency"] < 1 or options["repeat"] < 1:
+            raise CommandError("--concurrency and --repeat must be positive integers.")
+
+        corpus = load_corpus(options["corpus"])
+        if not corpus:
+            raise CommandError(f"No *.log files found in {options['corpus']}")
+
+        recordings: Path = options["recordings"]
+        fake = FakeBackend(latency_ms=options["fake_latency_ms"])
+        if options["backend"] == "recorded":
+            if recordings is None:
+                raise CommandError("--backend recorded requires --recordings.")
+            backend = RecordedBackend(recordings, fallback=fake if options["allow_fake_fallback"] else None)
+        elif options["backend"] == "live":
+            backend = RecordedBackend(recordings, fallback=live_backend, record=True) if recordings else live_backend
+        else:
+            backend = fake
+
+        reports: List[Dict[str, Any]] = []
+        try:
+            for model in options["model"]:
+                for max_tokens in options["max_tokens"]:
+                    reports.append(evaluate(
+                        backend, corpus, model, max_tokens,
+                        concurrency=options["concurrency"], repeat=options["repeat"],
+                    ))
+        except RecordingMissingError as e:
+            raise CommandError(
+                f"{e}. Record it with --backend live --recordings, or pass --allow-fake-fallback."
+            )
+
+        if isinstance(backend, RecordedBackend) and backend.record:
+            backend.save()
+
+        self._print_table(reports, len(corpus))
+        if options["backend"] == "recorded" and any(report["cache_misses"] for report in reports):
+            self.stderr.write(self.style.WARNING(
+                "Some requests had no recording and used the fake backend; their synthetic "
+                "tokens and compliance are included in the metrics, and their latency is "
+                "reported in the live columns (see the 'miss' column)."
+            ))
+        if options["json"]:
+            options["json"].write_text(json.dumps(reports, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['json']}"))
+
+    def _print_table(self, reports: List[Dict[str, Any]], corpus_size: int) -> None:
+        self.stdout.write(f"Corpus: {corpus_size} logs")
+        self.stdout.write("Latencies in ms: live = calls made in this run, replay = recorded latency of replayed responses")
+        header = (
+            f"{'model':<16}{'max_tok':>8}{'runs':>6}{'err':>5}{'prompt_tok':>12}{'compl_tok':>11}"
+            f"{'live p50':>10}{'p90':>8}{'p99':>8}{'replay p50':>12}{'p90':>8}{'p99':>8}"
+            f"{'cache':>7}{'miss':>6}{'format':>8}"
+        )
+        self.stdout.write(header)
+        for report in reports:
+            self.stdout.write(
+                f"{report['model']:<16}{report['max_tokens']:>8}{report['runs']:>6}{report['errors']:>5}"
+                f"{report['prompt_tokens']:>12}{report['completion_tokens']:>11}"
+                f"{self._ms(report['latency_p50_ms'], 10)}{self._ms(report['latency_p90_ms'], 8)}"
+                f"{self._ms(report['latency_p99_ms'], 8)}{self._ms(report['replay_latency_p50_ms'], 12)}"
+                f"{self._ms(report['replay_latency_p90_ms'], 8)}{self._ms(report['replay_latency_p99_ms'], 8)}"
+                f"{report['cache_hit_rate']:>7.0%}{report['cache_misses']:>6}{report['compliance_rate']:>8.0%}"
+            )
+
+    @staticmethod
+    def _ms(value: Optional[float], width: int) -> str:
+        return f"{value:>{width}.1f}" if value is not None else f"{'-':>{width}}"
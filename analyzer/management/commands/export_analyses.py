@@ -0,0 +1,101 @@
+import gzip
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from analyzer.models import LogAnalysis
+
+EXPORT_FIELDS = ["log_input", "ai_response", "ip_address", "session_id", "fingerprint", "created_at"]
+
+
+def iter_analysis_rows(chunk_size: int) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every LogAnalysis row as a plain dict.
+
+    Uses QuerySet.iterator(), which opens a server-side cursor on PostgreSQL,
+    so only `chunk_size` rows are held in memory at a time.
+
+    Args:
+        chunk_size: Number of rows fetched from the database per round trip
+
+    Yields:
+        One dict per analysis, with created_at as an aware datetime
+    """
+    queryset = LogAnalysis.objects.order_by("id").values(*EXPORT_FIELDS)
+    yield from queryset.iterator(chunk_size=chunk_size)
+
+
+class Command(BaseCommand):
+    help = "Stream all log analyses to a JSONL (optionally gzipped) or Parquet file."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="Output file. Use a .gz suffix to compress JSONL.")
+        parser.add_argument(
+            "--format", choices=["jsonl", "parquet"], default="jsonl",
+            help="Output format (default: jsonl). Parquet requires pyarrow.",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=2000,
+            help="Rows fetched and written per batch (default: 2000).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: str = options["path"]
+        chunk_size: int = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
+
+        started = time.monotonic()
+        if options["format"] == "parquet":
+            count = self._write_parquet(path, chunk_size)
+        else:
+            count = self._write_jsonl(path, chunk_size)
+        elapsed = time.monotonic() - started
+
+        rate = count / elapsed if elapsed > 0 else float(count)
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {count} analyses to {path} in {elapsed:.2f}s ({rate:.0f} rows/s)"
+        ))
+
+    def _write_jsonl(self, path: str, chunk_size: int) -> int:
+        opener = gzip.open if path.endswith(".gz") else open
+        count = 0
+        with opener(path, "wt", encoding="utf-8") as output:
+            for row in iter_analysis_rows(chunk_size):
+                row["created_at"] = row["created_at"].isoformat() if row["created_at"] else None
+                output.write(json.dumps(row, ensure_ascii=False))
+                output.write("\n")
+                count += 1
+        return count
+
+    def _write_parquet(self, path: str, chunk_size: int) -> int:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise CommandError("Parquet export requires pyarrow: pip install pyarrow")
+
+        schema = pa.schema([
+            (name, pa.timestamp("us", tz="UTC") if name == "created_at" else pa.string())
+            for name in EXPORT_FIELDS
+        ])
+        count = 0
+        batch: List[Dict[str, Any]] = []
+        writer: Optional[pq.ParquetWriter] = None
+        try:
+            writer = pq.ParquetWriter(path, schema, compression="zstd")
+            for row in iter_analysis_rows(chunk_size):
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                    count += len(batch)
+                    batch = []
+            if batch:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                count += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return count
@@ -0,0 +1,163 @@
+import gzip
+import json
+import time
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, Iterator, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from analyzer.models import LogAnalysis, compute_fingerprint
+
+
+def build_analysis(row: Any, row_number: int) -> LogAnalysis:
+    """
+    Build and validate an unsaved LogAnalysis from an exported row.
+
+    Args:
+        row: A dict with the fields written by export_analyses
+        row_number: Position of the row in the file, used in error messages
+
+    Returns:
+        A LogAnalysis instance with its fingerprint, sections and created_at populated
+
+    Raises:
+        CommandError: If the row is not an object or has invalid fields
+    """
+    if not isinstance(row, dict):
+        raise CommandError(f"Row {row_number}: expected an object, got {type(row).__name__}")
+    log_input = row.get("log_input") or ""
+    ai_response = row.get("ai_response") or ""
+    if not isinstance(log_input, str) or not isinstance(ai_response, str):
+        raise CommandError(f"Row {row_number}: log_input and ai_response must be strings")
+
+    created_at = row.get("created_at")
+    if isinstance(created_at, datetime):
+        # Parquet stores created_at as a UTC timestamp column
+        if timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at, dt_timezone.utc)
+    elif created_at:
+        try:
+            created_at = parse_datetime(str(created_at))
+        except ValueError:
+            created_at = None
+        if created_at is None:
+            raise CommandError(f"Row {row_number}: invalid created_at {row['created_at']!r}")
+    analysis = LogAnalysis(
+        log_input=log_input,
+        ai_response=ai_response,
+        ip_address=row.get("ip_address"),
+        session_id=row.get("session_id"),
+        # Never trust the file's fingerprint as the dedup key; handle() reports mismatches
+        fingerprint=compute_fingerprint(log_input, ai_response),
+        created_at=created_at or timezone.now(),
+    )
+    # bulk_create skips save(), so parse the response sections here.
+    analysis.set_sections()
+    return analysis
+
+
+class Command(BaseCommand):
+    help = (
+        "Import log analyses from a JSONL (optionally gzipped) or Parquet file, skipping rows whose "
+        "fingerprint already exists. Deduplication is check-then-insert without a unique constraint, "
+        "so do not run it concurrently with another import or while the site accepts new analyses."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="Input file written by export_analyses.")
+        parser.add_argument(
+            "--format", choices=["jsonl", "parquet"], default="jsonl",
+            help="Input format (default: jsonl). Parquet requires pyarrow.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Rows inserted per bulk_create call (default: 1000).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: str = options["path"]
+        batch_size: int = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        if options["format"] == "parquet":
+            rows = self._read_parquet(path, batch_size)
+        else:
+            rows = self._read_jsonl(path)
+
+        started = time.monotonic()
+        read = created = mismatched = 0
+        batch: List[LogAnalysis] = []
+        try:
+            # Each batch is fully read and validated before it is inserted, so a
+            # bad row never leaves a half-written batch behind.
+            for row in rows:
+                read += 1
+                analysis = build_analysis(row, read)
+                if row.get("fingerprint") and row["fingerprint"] != analysis.fingerprint:
+                    mismatched += 1
+                batch.append(analysis)
+                if len(batch) >= batch_size:
+                    created += self._insert_batch(batch)
+                    batch = []
+            if batch:
+                created += self._insert_batch(batch)
+        except CommandError as e:
+            raise CommandError(
+                f"{e}. Import stopped: {created} analyses from earlier batches were already committed."
+            )
+        elapsed = time.monotonic() - started
+
+        rate = read / elapsed if elapsed > 0 else float(read)
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {read} rows, imported {created}, skipped {read - created} duplicates "
+            f"in {elapsed:.2f}s ({rate:.0f} rows/s)"
+        ))
+        if mismatched:
+            self.stderr.write(self.style.WARNING(
+                f"{mismatched} rows had a fingerprint that did not match their content; "
+                "the recomputed fingerprint was used."
+            ))
+
+    def _insert_batch(self, batch: List[LogAnalysis]) -> int:
+        """Insert the analyses whose fingerprint is not already stored."""
+        fingerprints = {analysis.fingerprint for analysis in batch}
+        seen = set(
+            LogAnalysis.objects.filter(fingerprint__in=fingerprints).values_list("fingerprint", flat=True)
+        )
+        fresh: List[LogAnalysis] = []
+        for analysis in batch:
+            if analysis.fingerprint not in seen:
+                seen.add(analysis.fingerprint)
+                fresh.append(analysis)
+        LogAnalysis.objects.bulk_create(fresh, batch_size=len(batch))
+        return len(fresh)
+
+    def _read_jsonl(self, path: str) -> Iterator[Dict[str, Any]]:
+        opener = gzip.open if path.endswith(".gz") else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as source:
+                for line_number, line in enumerate(source, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise CommandError(f"Invalid JSON on line {line_number}: {e}")
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {path}")
+
+    def _read_parquet(self, path: str, batch_size: int) -> Iterator[Dict[str, Any]]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise CommandError("Parquet import requires pyarrow: pip install pyarrow")
+
+        try:
+            parquet_file = pq.ParquetFile(path)
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {path}")
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+            yield from record_batch.to_pylist()
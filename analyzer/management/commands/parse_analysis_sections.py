@@ -0,0 +1,48 @@
+import time
+from typing import Any, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from analyzer.models import LogAnalysis
+from analyzer.sections import SECTION_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Backfill the structured section fields parsed from each analysis' AI response."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Re-parse every analysis, not only the ones without sections.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Rows updated per bulk_update call (default: 1000).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        queryset = LogAnalysis.objects.only("id", "ai_response").order_by("id")
+        if not options["all"]:
+            queryset = queryset.filter(error_summary__isnull=True)
+
+        fields = list(SECTION_FIELDS.values())
+        started = time.monotonic()
+        updated = 0
+        batch: List[LogAnalysis] = []
+        for analysis in queryset.iterator(chunk_size=batch_size):
+            analysis.set_sections()
+            batch.append(analysis)
+            if len(batch) >= batch_size:
+                LogAnalysis.objects.bulk_update(batch, fields)
+                updated += len(batch)
+                batch = []
+        if batch:
+            LogAnalysis.objects.bulk_update(batch, fields)
+            updated += len(batch)
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(f"Parsed sections for {updated} analyses in {elapsed:.2f}s"))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:00
+
+import hashlib
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def compute_fingerprint(log_input, ai_response):
+    # Frozen copy of analyzer.models.compute_fingerprint at the time of this migration
+    digest = hashlib.sha256()
+    digest.update(log_input.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(ai_response.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def backfill_fingerprints(apps, schema_editor):
+    LogAnalysis = apps.get_model('analyzer', 'LogAnalysis')
+    pending = LogAnalysis.objects.filter(fingerprint__isnull=True).only('id', 'log_input', 'ai_response')
+    batch = []
+    for analysis in pending.iterator(chunk_size=BATCH_SIZE):
+        analysis.fingerprint = compute_fingerprint(analysis.log_input, analysis.ai_response)
+        batch.append(analysis)
+        if len(batch) >= BATCH_SIZE:
+            LogAnalysis.objects.bulk_update(batch, ['fingerprint'])
+            batch = []
+    if batch:
+        LogAnalysis.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0003_alter_loganalysis_options_loganalysis_session_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loganalysis',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
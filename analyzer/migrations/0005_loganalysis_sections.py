@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0004_loganalysis_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loganalysis',
+            name='error_summary',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='loganalysis',
+            name='explanation',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='loganalysis',
+            name='possible_causes',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='loganalysis',
+            name='suggestions',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
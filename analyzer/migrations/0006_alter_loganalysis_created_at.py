@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0005_loganalysis_sections'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loganalysis',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
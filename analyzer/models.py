@@ -1,4 +1,43 @@
+import hashlib
+
 from django.db import models
+from django.utils import timezone
+
+from debug_buddy.routers import READ_REPLICA_HINT
+
+from .sections import ERROR_SUMMARY_MAX_LENGTH, SECTION_FIELDS, parse_response
+
+# Fields the fingerprint and parsed sections are derived from
+CONTENT_FIELDS = ("log_input", "ai_response")
+
+
+def compute_fingerprint(log_input: str, ai_response: str) -> str:
+    """
+    Compute a stable fingerprint for an analysis, used to deduplicate imports.
+
+    Args:
+        log_input: The analyzed log text
+        ai_response: The AI response text
+
+    Returns:
+        A 64-character hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(log_input.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(ai_response.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LogAnalysisManager(models.Manager):
+    def replica(self) -> models.QuerySet:
+        """
+        Queryset for read-only listings (history, search, dashboards).
+
+        The READ_REPLICA_HINT hint lets ReadReplicaRouter serve it from the
+        read replica when one is configured; all other queries use the primary.
+        """
+        return self.db_manager(hints={READ_REPLICA_HINT: True}).all()
 
 
 class LogAnalysis(models.Model):
@@ -6,10 +45,71 @@ class LogAnalysis(models.Model):
     ai_response = models.TextField()
     ip_address = models.CharField(max_length=45, blank=True, null=True)
     session_id = models.CharField(max_length=40, blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    fingerprint = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    # Sections parsed from ai_response at write time; NULL means not parsed yet.
+    error_summary = models.CharField(max_length=ERROR_SUMMARY_MAX_LENGTH, blank=True, null=True, db_index=True)
+    explanation = models.TextField(blank=True, null=True)
+    possible_causes = models.TextField(blank=True, null=True)
+    suggestions = models.TextField(blank=True, null=True)
+    # A default rather than auto_now_add, so bulk imports can keep original timestamps
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    objects = LogAnalysisManager()
 
     class Meta:
         verbose_name_plural = "Log Analyses"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded content so save() can tell when it was edited
+        instance._loaded_content = {
+            name: instance.__dict__[name] for name in CONTENT_FIELDS if name in instance.__dict__
+        }
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._loaded_content = {
+            name: self.__dict__[name] for name in CONTENT_FIELDS if name in self.__dict__
+        }
+
+    def _content_changed(self, name: str) -> bool:
+        loaded = getattr(self, "_loaded_content", None)
+        if loaded is None:
+            return False
+        if name in loaded:
+            return self.__dict__.get(name, loaded[name]) != loaded[name]
+        # The field was deferred when loaded; assigning it loads it into __dict__
+        return name in self.__dict__
+
+    def save(self, *args, **kwargs):
+        """
+        Save the analysis, keeping fingerprint and sections in sync with its content.
+
+        Both are recomputed when log_input or ai_response changed since the row
+        was loaded. QuerySet.update() bypasses this, so run
+        parse_analysis_sections --all after bulk edits of ai_response.
+        """
+        derived = []
+        response_changed = self._content_changed("ai_response")
+        if not self.fingerprint or response_changed or self._content_changed("log_input"):
+            self.fingerprint = compute_fingerprint(self.log_input, self.ai_response)
+            derived.append("fingerprint")
+        if self.error_summary is None or response_changed:
+            self.set_sections()
+            derived.extend(SECTION_FIELDS.values())
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and derived:
+            kwargs["update_fields"] = set(update_fields) | set(derived)
+        super().save(*args, **kwargs)
+        self._loaded_content = {name: getattr(self, name) for name in CONTENT_FIELDS}
+
+    def set_sections(self) -> None:
+        """Populate the section fields by parsing ai_response."""
+        for field, value in parse_response(self.ai_response).items():
+            setattr(self, field, value)
+
     def __str__(self):
-        return f"Análise #{self.id}"
\ No newline at end of file
+        return f"Análise #{self.id}"
@@ -0,0 +1,84 @@
+import re
+from typing import Dict
+
+# Maps each heading requested by build_prompt to the LogAnalysis field it fills.
+SECTION_FIELDS: Dict[str, str] = {
+    "ERRO IDENTIFICADO": "error_summary",
+    "EXPLICAÇÃO": "explanation",
+    "POSSÍVEIS CAUSAS": "possible_causes",
+    "SUGESTÕES": "suggestions",
+}
+
+ERROR_SUMMARY_MAX_LENGTH = 255
+
+# Matches a candidate heading line such as "1. ERRO IDENTIFICADO: ...",
+# "**EXPLICAÇÃO:**" or "### 4. SUGESTÕES", tolerating missing accents in the
+# model's output. parse_response decides which candidates are real headings.
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?P<prefix>(?:#+[ \t]*)?(?:\d+[.)][ \t]*)?[*_]*)"
+    r"(?P<name>ERRO IDENTIFICADO|EXPLICA[ÇC][ÃA]O|POSS[ÍI]VEIS CAUSAS|SUGEST[ÕO]ES)"
+    r"[*_]*[ \t]*(?P<colon>:)?[*_]*[ \t]*(?P<rest>.*)$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_UNACCENTED = {
+    "EXPLICACAO": "EXPLICAÇÃO",
+    "POSSIVEIS CAUSAS": "POSSÍVEIS CAUSAS",
+    "SUGESTOES": "SUGESTÕES",
+}
+
+
+def _canonical_heading(name: str) -> str:
+    name = name.upper()
+    stripped = name.replace("Ç", "C").replace("Ã", "A").replace("Í", "I").replace("Õ", "O")
+    return _UNACCENTED.get(stripped, name)
+
+
+def parse_response(text: str) -> Dict[str, str]:
+    """
+    Split an AI response into the four sections requested by build_prompt.
+
+    Text before the first heading is ignored. Headings with a numbered or
+    markdown prefix take precedence over bare "Name:" lines, and are only
+    recognized in prompt order; anything else stays in the current section.
+    If no heading is found the whole response is kept as the explanation so
+    nothing is lost.
+
+    Args:
+        text: The raw AI response
+
+    Returns:
+        A dict keyed by LogAnalysis field name (error_summary, explanation,
+        possible_causes, suggestions); missing sections map to ''
+    """
+    sections = {field: "" for field in SECTION_FIELDS.values()}
+    order = list(SECTION_FIELDS)
+
+    # Keep only real headings, in prompt order. Anything else, including a body
+    # line that merely starts with a heading word or a repeated heading, stays
+    # in the text of the current section.
+    # Prefer headings with a numbered/markdown prefix; bare "Name:" lines only
+    # count as headings when the response has no prefixed headings at all.
+    candidates = list(_HEADING_RE.finditer(text))
+    prefixed = [match for match in candidates if match.group("prefix").strip()]
+    if not prefixed:
+        prefixed = [match for match in candidates if match.group("colon")]
+
+    headings = []
+    last_position = -1
+    for match in prefixed:
+        position = order.index(_canonical_heading(match.group("name")))
+        if position > last_position:
+            headings.append((match, SECTION_FIELDS[order[position]]))
+            last_position = position
+
+    if not headings:
+        sections["explanation"] = text.strip()
+        return sections
+
+    for index, (match, field) in enumerate(headings):
+        end = headings[index + 1][0].start() if index + 1 < len(headings) else len(text)
+        sections[field] = (match.group("rest") + text[match.end():end]).strip()
+
+    sections["error_summary"] = sections["error_summary"].strip("*_ ")[:ERROR_SUMMARY_MAX_LENGTH]
+    return sections
@@ -0,0 +1,18 @@
+import math
+from typing import Sequence
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """
+    Nearest-rank percentile of a non-empty sequence.
+
+    Args:
+        values: The measurements
+        percent: Percentile between 0 and 100
+
+    Returns:
+        The smallest value with at least `percent`% of the values at or below it
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
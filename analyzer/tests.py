@@ -1,8 +1,23 @@
-from django.test import TestCase, Client, RequestFactory
+import gzip
+from datetime import datetime, timezone as dt_timezone
+import json
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import TestCase, Client, RequestFactory, override_settings
+from debug_buddy.routers import READ_REPLICA_HINT, ReadReplicaRouter
 from django.urls import reverse
 from unittest.mock import patch, MagicMock
-from .models import LogAnalysis
-from .views import build_prompt
+from .models import LogAnalysis, compute_fingerprint
+from .management.commands.import_analyses import build_analysis
+from .evaluation import FakeBackend, RecordedBackend, evaluate, load_corpus
+from .sections import parse_response
+from .stats import percentile
+from .views import build_prompt, history_queryset
 
 
 class LogAnalysisModelTests(TestCase):
@@ -41,6 +56,19 @@ class LogAnalysisModelTests(TestCase):
 
         self.assertIn(f"Análise #{log_analysis.id}", str(log_analysis))
 
+    def test_fingerprint_set_on_save(self) -> None:
+        """
+        Test that saving a LogAnalysis fills in its content fingerprint.
+
+        The fingerprint is what import_analyses uses to skip duplicates.
+        """
+        log_analysis = LogAnalysis.objects.create(
+            log_input="Test log",
+            ai_response="Test response"
+        )
+
+        self.assertEqual(log_analysis.fingerprint, compute_fingerprint("Test log", "Test response"))
+
 
 class BuildPromptTests(TestCase):
     """Test suite for the build_prompt function."""
@@ -60,6 +88,130 @@ class BuildPromptTests(TestCase):
         self.assertIn(log_text, prompt)
 
 
+SAMPLE_RESPONSE = """1. ERRO IDENTIFICADO: ImportError ao importar o módulo django.
+
+2. EXPLICAÇÃO:
+O Python não encontrou o pacote django.
+
+3. **POSSÍVEIS CAUSAS:**
+- Ambiente virtual não ativado
+- Django não instalado
+
+4. SUGESTOES:
+Ative o ambiente virtual e rode pip install django.
+"""
+
+
+class ParseResponseTests(TestCase):
+    """Test suite for the parse_response function."""
+
+    def test_parse_response_sections(self) -> None:
+        """
+        Test that parse_response splits a response into the four prompt sections.
+
+        Covers numbered headings, bold markers and headings without accents.
+        """
+        sections = parse_response(SAMPLE_RESPONSE)
+
+        self.assertEqual(sections["error_summary"], "ImportError ao importar o módulo django.")
+        self.assertEqual(sections["explanation"], "O Python não encontrou o pacote django.")
+        self.assertIn("Ambiente virtual não ativado", sections["possible_causes"])
+        self.assertEqual(sections["suggestions"], "Ative o ambiente virtual e rode pip install django.")
+
+    def test_parse_response_keeps_body_lines_starting_with_heading_words(self) -> None:
+        """
+        Test that body lines starting with a heading word stay in their section.
+
+        Lines without a numbered/markdown prefix or a colon after the heading
+        name, and headings repeated out of order, are part of the body text.
+        """
+        response = SAMPLE_RESPONSE.replace(
+            "Ative o ambiente virtual e rode pip install django.",
+            "Faça X.\nExplicação adicional: o campo id falta.\nSugestões extras abaixo\n- Y\n2. EXPLICAÇÃO: repetida"
+        )
+
+        sections = parse_response(response)
+
+        self.assertEqual(sections["explanation"], "O Python não encontrou o pacote django.")
+        self.assertEqual(
+            sections["suggestions"],
+            "Faça X.\nExplicação adicional: o campo id falta.\nSugestões extras abaixo\n- Y\n2. EXPLICAÇÃO: repetida"
+        )
+
+    def test_parse_response_prefers_numbered_headings(self) -> None:
+        """
+        Test that a "Name:" body line does not override the numbered headings.
+
+        Colon-only headings are only used when the response has no numbered
+        or markdown headings.
+        """
+        response = (
+            "1. ERRO IDENTIFICADO: X\nSugestões: veja abaixo\n"
+            "2. EXPLICAÇÃO: y\n3. POSSÍVEIS CAUSAS: z\n4. SUGESTÕES: w"
+        )
+
+        sections = parse_response(response)
+
+        self.assertEqual(sections["error_summary"], "X\nSugestões: veja abaixo")
+        self.assertEqual(sections["explanation"], "y")
+        self.assertEqual(sections["possible_causes"], "z")
+        self.assertEqual(sections["suggestions"], "w")
+
+        plain = parse_response("Erro identificado: X\nExplicação: y\nSugestões: w")
+        self.assertEqual(plain["explanation"], "y")
+        self.assertEqual(plain["suggestions"], "w")
+
+    def test_parse_response_without_headings(self) -> None:
+        """
+        Test that a response without headings is kept whole as the explanation.
+        """
+        sections = parse_response("Resposta livre sem seções.")
+
+        self.assertEqual(sections["error_summary"], "")
+        self.assertEqual(sections["explanation"], "Resposta livre sem seções.")
+
+    def test_sections_stored_on_save(self) -> None:
+        """
+        Test that saving a LogAnalysis stores the parsed sections.
+        """
+        log_analysis = LogAnalysis.objects.create(log_input="Test log", ai_response=SAMPLE_RESPONSE)
+
+        self.assertEqual(log_analysis.error_summary, "ImportError ao importar o módulo django.")
+        self.assertIn("pip install django", log_analysis.suggestions)
+
+    def test_editing_response_recomputes_derived_fields(self) -> None:
+        """
+        Test that changing ai_response refreshes the sections and fingerprint on save.
+
+        Also covers update_fields, which must include the derived columns.
+        """
+        log_analysis = LogAnalysis.objects.create(log_input="Test log", ai_response="Antiga")
+        log_analysis = LogAnalysis.objects.get(pk=log_analysis.pk)
+
+        log_analysis.ai_response = SAMPLE_RESPONSE
+        log_analysis.save(update_fields=["ai_response"])
+
+        log_analysis.refresh_from_db()
+        self.assertEqual(log_analysis.error_summary, "ImportError ao importar o módulo django.")
+        self.assertEqual(log_analysis.fingerprint, compute_fingerprint("Test log", SAMPLE_RESPONSE))
+
+    def test_parse_analysis_sections_command(self) -> None:
+        """
+        Test that parse_analysis_sections backfills rows saved before parsing existed.
+        """
+        log_analysis = LogAnalysis.objects.create(log_input="Test log", ai_response=SAMPLE_RESPONSE)
+        LogAnalysis.objects.filter(pk=log_analysis.pk).update(
+            error_summary=None, explanation=None, possible_causes=None, suggestions=None
+        )
+
+        out = StringIO()
+        call_command("parse_analysis_sections", stdout=out)
+
+        log_analysis.refresh_from_db()
+        self.assertEqual(log_analysis.error_summary, "ImportError ao importar o módulo django.")
+        self.assertIn("Parsed sections for 1 analyses", out.getvalue())
+
+
 class AnalyzeLogViewTests(TestCase):
     """Test suite for the analyze_log view function."""
 
@@ -228,4 +380,344 @@ class HistoryViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         analyses = response.context['analyses']
         self.assertEqual(len(analyses), 1)
-        self.assertEqual(analyses[0].ip_address, '192.168.1.1')
\ No newline at end of file
+        self.assertEqual(analyses[0].ip_address, '192.168.1.1')
+
+    def test_history_view_defers_raw_response(self) -> None:
+        """
+        Test the history view loads parsed sections instead of the raw response.
+
+        The ai_response column should be deferred, since the template renders
+        the section fields stored at write time.
+        """
+        response = self.client.get(
+            reverse('history'),
+            REMOTE_ADDR='192.168.1.1'
+        )
+
+        analysis = response.context['analyses'][0]
+        self.assertIn('ai_response', analysis.get_deferred_fields())
+        self.assertEqual(analysis.explanation, 'Test response 3')
+
+    def test_history_view_unparsed_rows_need_no_extra_queries(self) -> None:
+        """
+        Test that rows saved before section parsing do not cause an N+1.
+
+        Their raw response is loaded in the same query as the sections, so
+        the query count does not grow with the number of unparsed rows.
+        """
+        for index in range(5):
+            LogAnalysis.objects.create(
+                log_input=f"Old log {index}",
+                ai_response=f"Old response {index}",
+                ip_address="10.0.0.5"
+            )
+        LogAnalysis.objects.filter(ip_address="10.0.0.5").update(error_summary=None)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('history'), REMOTE_ADDR='10.0.0.5')
+
+        self.assertContains(response, "Old response 4")
+
+
+class ExportImportCommandTests(TestCase):
+    """Test suite for the export_analyses and import_analyses commands."""
+
+    def setUp(self) -> None:
+        """
+        Set up test environment before each test.
+
+        Creates two analyses and a temporary directory for export files.
+        """
+        self.first = LogAnalysis.objects.create(
+            log_input="Test log 1",
+            ai_response="Test response 1",
+            ip_address="127.0.0.1"
+        )
+        LogAnalysis.objects.create(
+            log_input="Test log 2",
+            ai_response="Test response 2",
+            session_id="abc"
+        )
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "analyses.jsonl.gz")
+
+    def tearDown(self) -> None:
+        """Remove the temporary export directory."""
+        self.tmpdir.cleanup()
+
+    def test_export_writes_gzipped_jsonl(self) -> None:
+        """
+        Test that export_analyses writes one JSON object per analysis.
+
+        Verifies that the .gz suffix produces a gzip file and that the
+        reported row count matches the table.
+        """
+        out = StringIO()
+        call_command("export_analyses", self.path, "--chunk-size", "1", stdout=out)
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as source:
+            rows = [json.loads(line) for line in source]
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["log_input"], "Test log 1")
+        self.assertEqual(rows[0]["fingerprint"], self.first.fingerprint)
+        self.assertIn("Exported 2 analyses", out.getvalue())
+
+    def test_import_round_trip_skips_duplicates(self) -> None:
+        """
+        Test that import_analyses restores rows and deduplicates on fingerprint.
+
+        Exports the table, deletes one row, and re-imports: only the deleted
+        row should be recreated, with its original created_at preserved.
+        """
+        call_command("export_analyses", self.path, stdout=StringIO())
+        original_created_at = self.first.created_at
+        self.first.delete()
+
+        out = StringIO()
+        call_command("import_analyses", self.path, "--batch-size", "1", stdout=out)
+
+        self.assertEqual(LogAnalysis.objects.count(), 2)
+        restored = LogAnalysis.objects.get(log_input="Test log 1")
+        self.assertEqual(restored.created_at, original_created_at)
+        self.assertEqual(restored.ip_address, "127.0.0.1")
+        self.assertIn("imported 1, skipped 1", out.getvalue())
+
+    def test_build_analysis_accepts_parquet_timestamps(self) -> None:
+        """
+        Test that build_analysis keeps datetime values read from Parquet.
+
+        Parquet stores created_at as a UTC timestamp column, which pyarrow
+        returns as datetime objects rather than ISO strings.
+        """
+        created_at = datetime(2025, 7, 14, 3, 11, 5, 123456, tzinfo=dt_timezone.utc)
+
+        analysis = build_analysis(
+            {"log_input": "Log", "ai_response": "Resposta", "created_at": created_at}, 1
+        )
+
+        self.assertEqual(analysis.created_at, created_at)
+
+    def test_import_recomputes_fingerprint_from_content(self) -> None:
+        """
+        Test that a stale fingerprint in the file is ignored and reported.
+
+        The row duplicates an existing analysis but carries a different
+        fingerprint, so trusting the file would insert a duplicate.
+        """
+        path = os.path.join(self.tmpdir.name, "stale.jsonl")
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(json.dumps({
+                "log_input": "Test log 1", "ai_response": "Test response 1", "fingerprint": "0" * 64
+            }) + "\n")
+
+        out, err = StringIO(), StringIO()
+        call_command("import_analyses", path, stdout=out, stderr=err)
+
+        self.assertEqual(LogAnalysis.objects.filter(log_input="Test log 1").count(), 1)
+        self.assertIn("imported 0, skipped 1", out.getvalue())
+        self.assertIn("1 rows had a fingerprint that did not match", err.getvalue())
+
+    def test_import_reports_committed_rows_on_invalid_input(self) -> None:
+        """
+        Test that an invalid row stops the import and reports what was committed.
+
+        The first batch is inserted; the batch containing the bad row is not.
+        """
+        path = os.path.join(self.tmpdir.name, "broken.jsonl")
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(json.dumps({"log_input": "New log 1", "ai_response": "R1"}) + "\n")
+            output.write(json.dumps({"log_input": "New log 2", "ai_response": "R2"}) + "\n")
+            output.write(json.dumps({"log_input": "New log 3", "ai_response": "R3"}) + "\n")
+            output.write("{not json\n")
+
+        with self.assertRaisesMessage(CommandError, "2 analyses from earlier batches were already committed"):
+            call_command("import_analyses", path, "--batch-size", "2", stdout=StringIO())
+
+        self.assertTrue(LogAnalysis.objects.filter(log_input="New log 2").exists())
+        self.assertFalse(LogAnalysis.objects.filter(log_input="New log 3").exists())
+
+
+class ReadReplicaRouterTests(TestCase):
+    """Test suite for the ReadReplicaRouter database router."""
+
+    def setUp(self) -> None:
+        """Create the router under test."""
+        self.router = ReadReplicaRouter()
+
+    def test_reads_use_primary_without_replica(self) -> None:
+        """
+        Test that hinted reads are not routed when no replica is configured.
+        """
+        self.assertIsNone(self.router.db_for_read(LogAnalysis, **{READ_REPLICA_HINT: True}))
+
+    def test_replica_alias_must_be_configured(self) -> None:
+        """
+        Test that DATABASE_REPLICA_ALIAS is used once it names a configured database.
+        """
+        with override_settings(DATABASE_REPLICA_ALIAS='default'):
+            self.assertEqual(self.router.db_for_read(LogAnalysis, **{READ_REPLICA_HINT: True}), 'default')
+
+    @patch.object(ReadReplicaRouter, '_replica', return_value='replica')
+    def test_only_hinted_reads_go_to_replica(self, mock_replica: MagicMock) -> None:
+        """
+        Test the routing rules when a replica alias is configured.
+
+        Verifies that:
+        - Reads carrying the replica hint go to the replica
+        - Other reads, including other apps such as sessions, stay on the primary
+        - Writes stay on the primary
+        - Migrations never run against the replica
+        """
+        self.assertEqual(self.router.db_for_read(LogAnalysis, **{READ_REPLICA_HINT: True}), 'replica')
+        self.assertIsNone(self.router.db_for_read(LogAnalysis))
+        self.assertIsNone(self.router.db_for_read(Session))
+        self.assertEqual(self.router.db_for_write(LogAnalysis), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'analyzer'))
+        self.assertIsNone(self.router.allow_migrate('default', 'analyzer'))
+
+    @patch.object(ReadReplicaRouter, '_replica', return_value='replica')
+    def test_history_queryset_uses_replica(self, mock_replica: MagicMock) -> None:
+        """
+        Test that the history listing opts in to the replica while the default manager does not.
+        """
+        self.assertEqual(history_queryset().db, 'replica')
+        self.assertEqual(LogAnalysis.objects.all().db, 'default')
+
+
+class BenchmarkDbConnectionsCommandTests(TestCase):
+    """Test suite for the benchmark_db_connections command."""
+
+    def test_benchmark_db_connections_command(self) -> None:
+        """
+        Test that benchmark_db_connections reports both connection modes.
+        """
+        out = StringIO()
+        call_command("benchmark_db_connections", "--requests", "3", stdout=out)
+
+        self.assertIn("fresh", out.getvalue())
+        self.assertIn("persistent", out.getvalue())
+
+    def test_benchmark_refuses_pooled_connections(self) -> None:
+        """
+        Test that the benchmark refuses to run when connection pooling is enabled.
+
+        With a pool, closing a connection only returns it to the pool, so a
+        fresh-connection measurement would be meaningless.
+        """
+        settings_dict = connections['default'].settings_dict
+        with patch.dict(settings_dict, {'OPTIONS': {'pool': True}}):
+            with self.assertRaisesMessage(CommandError, "Connection pooling is enabled"):
+                call_command("benchmark_db_connections", stdout=StringIO())
+
+
+class EvaluationHarnessTests(TestCase):
+    """Test suite for the offline evaluation harness."""
+
+    def setUp(self) -> None:
+        """
+        Set up test environment before each test.
+
+        Loads the bundled corpus and a fake backend without simulated latency.
+        """
+        self.corpus = load_corpus()
+        self.fake = FakeBackend(latency_ms=0, ms_per_token=0)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """Remove the temporary recordings directory."""
+        self.tmpdir.cleanup()
+
+    def test_fake_backend_report(self) -> None:
+        """
+        Test that evaluate reports tokens and section compliance for the fake backend.
+
+        A generous max_tokens keeps every section; a tiny one truncates them.
+        """
+        report = evaluate(self.fake, self.corpus, "gpt-4", 1000, concurrency=2)
+        truncated = evaluate(self.fake, self.corpus, "gpt-4", 20, concurrency=2)
+
+        self.assertEqual(report["runs"], len(self.corpus))
+        self.assertEqual(report["errors"], 0)
+        self.assertGreater(report["prompt_tokens"], 0)
+        self.assertEqual(report["compliance_rate"], 1.0)
+        self.assertEqual(report["cache_hit_rate"], 0.0)
+        self.assertLess(truncated["compliance_rate"], 1.0)
+
+    def test_percentile_nearest_rank(self) -> None:
+        """
+        Test that percentile returns the nearest-rank value.
+        """
+        values = [15, 20, 35, 40, 50]
+
+        self.assertEqual(percentile(values, 30), 20)
+        self.assertEqual(percentile(values, 50), 35)
+        self.assertEqual(percentile(values, 100), 50)
+        self.assertEqual(percentile(values, 0), 15)
+
+    def test_recorded_backend_replays_responses(self) -> None:
+        """
+        Test that responses recorded in one run are replayed as cache hits in the next.
+        """
+        path = os.path.join(self.tmpdir.name, "recordings.json")
+        recorder = RecordedBackend(Path(path), fallback=self.fake, record=True)
+        evaluate(recorder, self.corpus, "gpt-4", 1000)
+        recorder.save()
+
+        replay = RecordedBackend(Path(path), fallback=self.fake)
+        report = evaluate(replay, self.corpus, "gpt-4", 1000)
+
+        self.assertEqual(report["cache_hit_rate"], 1.0)
+
+    def test_replay_reports_recorded_latency_separately(self) -> None:
+        """
+        Test that replayed responses report their recorded latency, not the lookup time.
+
+        Replayed latencies go in the replay_latency_* metrics and leave the
+        live latency_* metrics empty.
+        """
+        path = os.path.join(self.tmpdir.name, "recordings.json")
+        recorder = RecordedBackend(Path(path), fallback=FakeBackend(latency_ms=30, ms_per_token=0), record=True)
+        recorded = evaluate(recorder, self.corpus, "gpt-4", 1000)
+        recorder.save()
+
+        replay = evaluate(RecordedBackend(Path(path)), self.corpus, "gpt-4", 1000)
+
+        self.assertGreaterEqual(recorded["latency_p50_ms"], 30)
+        self.assertIsNone(recorded["replay_latency_p50_ms"])
+        self.assertIsNone(replay["latency_p50_ms"])
+        self.assertGreaterEqual(replay["replay_latency_p50_ms"], 30)
+
+    def test_recorded_backend_fails_on_missing_recording(self) -> None:
+        """
+        Test that a recorded run without fallback fails instead of mixing in fake data.
+        """
+        path = os.path.join(self.tmpdir.name, "empty.json")
+
+        with self.assertRaisesMessage(CommandError, "--allow-fake-fallback"):
+            call_command(
+                "evaluate_pipeline", "--backend", "recorded", "--recordings", path,
+                stdout=StringIO(), stderr=StringIO()
+            )
+
+        err = StringIO()
+        call_command(
+            "evaluate_pipeline", "--backend", "recorded", "--recordings", path,
+            "--allow-fake-fallback", "--fake-latency-ms", "0", stdout=StringIO(), stderr=err
+        )
+        self.assertIn("used the fake backend", err.getvalue())
+
+    @patch('openai.ChatCompletion.create')
+    def test_evaluate_pipeline_command(self, mock_openai: MagicMock) -> None:
+        """
+        Test that evaluate_pipeline prints one row per configuration without calling OpenAI.
+        """
+        out = StringIO()
+        call_command(
+            "evaluate_pipeline", "--max-tokens", "100", "1000",
+            "--fake-latency-ms", "0", stdout=out
+        )
+
+        self.assertIn(f"Corpus: {len(self.corpus)} logs", out.getvalue())
+        self.assertEqual(out.getvalue().count("gpt-4"), 2)
+        mock_openai.assert_not_called()
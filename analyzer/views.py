@@ -1,10 +1,45 @@
 from django.shortcuts import render
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse
+from django.db.models import Case, F, QuerySet, TextField, Value, When
 import openai
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from .models import LogAnalysis
 
+DEFAULT_MODEL = "gpt-4"
+DEFAULT_MAX_TOKENS = 1000
+DEFAULT_TEMPERATURE = 0.4
+SYSTEM_MESSAGE = "Você é um desenvolvedor backend sênior. Responda em português."
+
+# Columns rendered by the history page. ai_response is left out because the
+# parsed section fields already carry its content.
+HISTORY_FIELDS = (
+    "id", "log_input", "ip_address", "session_id", "created_at",
+    "error_summary", "explanation", "possible_causes", "suggestions",
+)
+
+
+def history_queryset() -> QuerySet:
+    """
+    Build the base queryset for the history page.
+
+    Only the rendered columns are selected. ai_response is loaded, as
+    raw_response, just for rows whose sections have not been parsed yet, so
+    those rows need no extra query.
+
+    Returns:
+        A LogAnalysis queryset ordered from newest to oldest
+    """
+    return (
+        LogAnalysis.objects.replica().only(*HISTORY_FIELDS)
+        .annotate(raw_response=Case(
+            When(error_summary__isnull=True, then=F("ai_response")),
+            default=Value(None),
+            output_field=TextField(),
+        ))
+        .order_by('-created_at')
+    )
+
 
 def build_prompt(log_text: str) -> str:
     """
@@ -32,6 +67,44 @@ Log:
 """
 
 
+def build_messages(log_text: str) -> List[Dict[str, str]]:
+    """
+    Build the chat messages sent to the AI model for a log.
+
+    Args:
+        log_text: The error log text to analyze
+
+    Returns:
+        The system and user messages for the chat completion call
+    """
+    return [
+        {"role": "system", "content": SYSTEM_MESSAGE},
+        {"role": "user", "content": build_prompt(log_text)}
+    ]
+
+
+def request_analysis(log_text: str, model: str = DEFAULT_MODEL,
+                     max_tokens: int = DEFAULT_MAX_TOKENS) -> Dict[str, Any]:
+    """
+    Send a log to OpenAI for analysis.
+
+    Args:
+        log_text: The error log text to analyze
+        model: The chat model to use
+        max_tokens: Upper bound on completion tokens
+
+    Returns:
+        The raw chat completion response
+    """
+    openai.api_key = settings.OPENAI_API_KEY
+    return openai.ChatCompletion.create(
+        model=model,
+        messages=build_messages(log_text),
+        temperature=DEFAULT_TEMPERATURE,
+        max_tokens=max_tokens
+    )
+
+
 def get_client_ip(request: HttpRequest) -> str:
     """
     Get the client's IP address from the request, handling both
@@ -90,18 +163,8 @@ def analyze_log(request: HttpRequest) -> HttpResponse:
     if request.method == "POST":
         log_text: Optional[str] = request.POST.get("log_text")
         if log_text:
-            openai.api_key = settings.OPENAI_API_KEY
-            prompt: str = build_prompt(log_text)
             try:
-                response = openai.ChatCompletion.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "Você é um desenvolvedor backend sênior. Responda em português."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.4,
-                    max_tokens=1000
-                )
+                response = request_analysis(log_text)
                 result = response['choices'][0]['message']['content']
 
                 try:
@@ -143,13 +206,13 @@ def history(request: HttpRequest) -> HttpResponse:
 
         # First try using IP address
         if client_ip:
-            analyses = LogAnalysis.objects.filter(ip_address=client_ip).order_by('-created_at')
+            analyses = history_queryset().filter(ip_address=client_ip)
             if analyses.exists():
                 return render(request, "analyzer/history.html", {"analyses": analyses})
 
         # Fallback to session ID if available and IP didn't yield results
         if session_id:
-            analyses = LogAnalysis.objects.filter(session_id=session_id).order_by('-created_at')
+            analyses = history_queryset().filter(session_id=session_id)
             if analyses.exists():
                 return render(request, "analyzer/history.html", {"analyses": analyses})
 
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Queryset hint marking a read that may be served by the read replica
+READ_REPLICA_HINT = 'read_replica'
+
+
+class ReadReplicaRouter:
+    """
+    Keep every query on the primary except reads that opt in to the replica.
+
+    A read goes to the replica only when its queryset carries the
+    READ_REPLICA_HINT hint (see LogAnalysis.objects.replica()) and
+    settings.DATABASE_REPLICA_ALIAS is configured in DATABASES. Local and test
+    setups with a single database are unaffected, and reads right after a
+    write, admin views and management commands stay on the primary.
+    """
+
+    def _replica(self):
+        alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+        return alias if alias in settings.DATABASES else None
+
+    def db_for_read(self, model, **hints):
+        if hints.get(READ_REPLICA_HINT):
+            return self._replica()
+        return None
+
+    def db_for_write(self, model, **hints):
+        # The replica is read-only, even for instances that were loaded from it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary and replica hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is read-only and follows the primary's schema
+        if db == self._replica():
+            return False
+        return None
@@ -81,6 +81,9 @@ TEMPLATES = [
 import dj_database_url
 import sys
 
+# Alias used by ReadReplicaRouter; reads are only routed when it is in DATABASES
+DATABASE_REPLICA_ALIAS = os.getenv('DATABASE_REPLICA_ALIAS', 'replica')
+
 # Define databases based on environment
 if 'test' in sys.argv:
     # Use SQLite for testing
@@ -91,11 +94,37 @@ if 'test' in sys.argv:
         }
     }
 else:
-    # Use PostgreSQL for normal operation
+    # Use PostgreSQL for normal operation.
+    # Connections are kept open for DB_CONN_MAX_AGE seconds and checked before
+    # reuse, so each request no longer pays a fresh TCP/TLS handshake.
+    DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '600'))
+    DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true'
+    # Optional in-process pool, backed by psycopg 3 with psycopg-pool (see
+    # requirements.txt). Django forbids combining it with persistent
+    # connections, so CONN_MAX_AGE is forced to 0.
+    DB_POOL = os.getenv('DB_POOL', 'False').lower() == 'true'
+
+    def database_config(env):
+        config = dj_database_url.config(
+            env=env,
+            conn_max_age=0 if DB_POOL else DB_CONN_MAX_AGE,
+            conn_health_checks=DB_CONN_HEALTH_CHECKS,
+        )
+        if DB_POOL and config:
+            config.setdefault('OPTIONS', {})['pool'] = True
+        return config
+
     DATABASES = {
-        'default': dj_database_url.config(default=os.getenv('DATABASE_URL'))
+        'default': database_config('DATABASE_URL')
     }
 
+    # Optional read replica, used only by querysets from LogAnalysis.objects.replica()
+    # (the history listing); every other query stays on 'default'.
+    if os.getenv('DATABASE_REPLICA_URL'):
+        DATABASES[DATABASE_REPLICA_ALIAS] = database_config('DATABASE_REPLICA_URL')
+
+DATABASE_ROUTERS = ['debug_buddy.routers.ReadReplicaRouter']
+
 CSRF_TRUSTED_ORIGINS = [
     'https://debugbuddy.up.railway.app',
 ]